@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from random import choice, randint, random, uniform
+from random import choice
 from typing import Iterable, List
 
-from sqlalchemy import select, func
+import numpy as np
+from sqlalchemy import bindparam, select, func, update
 import time
-import secrets
 from threading import Lock
 from sqlalchemy.orm import Session
 
@@ -21,98 +21,162 @@ DEFAULT_TICKERS = [
     ("SILVER", "Silver Futures"),
 ]
 
+_rng = np.random.default_rng()
+
+
+# Statements for the hot read paths, built once at import so each call only
+# binds parameters instead of reconstructing the expression tree
+_OPEN_ORDERS_STMT = (
+    select(Order)
+    .where(Order.entry_status.in_(bindparam("sts", expanding=True)))
+    .order_by(Order.last_updated.desc())
+)
+_RECENT_TRADES_STMT = (
+    select(TradeRecord).order_by(TradeRecord.fill_timestamp.desc()).limit(bindparam("lim"))
+)
+_TICKERS_STMT = select(Ticker).where(Ticker.active == True).order_by(Ticker.symbol)
+_ORDER_BY_ID_STMT = select(Order).where(Order.order_id == bindparam("oid"))
+_TRADES_BY_ORDER_STMT = (
+    select(TradeRecord)
+    .where(TradeRecord.order_id == bindparam("oid"))
+    .order_by(TradeRecord.fill_timestamp.desc())
+)
+_PRICE_HIST_STMT = (
+    select(PriceTick)
+    .where(PriceTick.symbol == bindparam("sym"))
+    .order_by(PriceTick.timestamp.desc())
+    .limit(bindparam("lim"))
+)
+
 
 def seed_if_empty(db: Session) -> None:
+    # One timestamp for the whole seed pass; no need for a clock read per row
+    now = datetime.utcnow()
+
     # Create tickers
     if db.query(Ticker).count() == 0:
-        for sym, desc in DEFAULT_TICKERS:
-            db.add(Ticker(symbol=sym, description=desc, active=True))
-        db.commit()
+        db.execute(
+            Ticker.__table__.insert(),
+            [
+                {"symbol": sym, "description": desc, "active": True}
+                for sym, desc in DEFAULT_TICKERS
+            ],
+        )
 
     # Create orders
     if db.query(Order).count() == 0:
-        order_id = 10000
-        for sym, _ in DEFAULT_TICKERS:
-            for _ in range(5):
-                order_id += 1
-                db.add(
-                    Order(
-                        order_id=order_id,
-                        ticker=sym,
-                        action=choice(["BUY", "SELL"]),
-                        quantity=choice([25, 50, 75, 100]),
-                        price=round(uniform(100.0, 50000.0), 2),
-                        entry_status=choice(["OPEN", "PENDING", "FILLED"]),
-                        exit_status=None,
-                        last_updated=datetime.utcnow(),
-                    )
-                )
-        db.commit()
+        # Draw all randomness for the pass in one vectorized batch instead
+        # of per-row choice()/uniform() calls
+        actions = ("BUY", "SELL")
+        quantities = (25, 50, 75, 100)
+        statuses = ("OPEN", "PENDING", "FILLED")
+        n = 5 * len(DEFAULT_TICKERS)
+        action_idx = _rng.integers(0, len(actions), size=n)
+        qty_idx = _rng.integers(0, len(quantities), size=n)
+        status_idx = _rng.integers(0, len(statuses), size=n)
+        prices = np.round(_rng.uniform(100.0, 50000.0, size=n), 2)
+        order_rows = [
+            {
+                "order_id": 10001 + i,
+                "ticker": DEFAULT_TICKERS[i // 5][0],
+                "action": actions[action_idx[i]],
+                "quantity": quantities[qty_idx[i]],
+                "price": float(prices[i]),
+                "entry_status": statuses[status_idx[i]],
+                "exit_status": None,
+                "last_updated": now,
+            }
+            for i in range(n)
+        ]
+        db.execute(Order.__table__.insert(), order_rows)
 
     # Create trades
     if db.query(TradeRecord).count() == 0:
-        trade_id = 9000
         orders = db.query(Order).limit(30).all()
-        for o in orders:
-            if random() < 0.6:
+        keep = _rng.random(size=len(orders)) < 0.6
+        jitter = _rng.uniform(-5, 5, size=len(orders))
+        trade_rows = []
+        trade_id = 9000
+        for i, o in enumerate(orders):
+            if keep[i]:
                 trade_id += 1
-                db.add(
-                    TradeRecord(
-                        trade_id=trade_id,
-                        order_id=o.order_id,
-                        tradingsymbol=o.ticker,
-                        product="MIS",
-                        quantity=o.quantity,
-                        average_price=o.price + uniform(-5, 5),
-                        transaction_type=o.action,
-                        fill_timestamp=datetime.utcnow(),
-                    )
+                trade_rows.append(
+                    {
+                        "trade_id": trade_id,
+                        "order_id": o.order_id,
+                        "tradingsymbol": o.ticker,
+                        "product": "MIS",
+                        "quantity": o.quantity,
+                        "average_price": o.price + float(jitter[i]),
+                        "transaction_type": o.action,
+                        "fill_timestamp": now,
+                    }
                 )
-        db.commit()
+        if trade_rows:
+            db.execute(TradeRecord.__table__.insert(), trade_rows)
+
+    db.commit()
 
 
 def get_open_orders(db: Session) -> List[Order]:
-    return (
-        db.query(Order)
-        .filter(Order.entry_status.in_(["OPEN", "PENDING"]))
-        .order_by(Order.last_updated.desc())
-        .all()
-    )
+    return db.execute(_OPEN_ORDERS_STMT, {"sts": ["OPEN", "PENDING"]}).scalars().all()
 
 
 def get_recent_trades(db: Session, limit: int = 100) -> List[TradeRecord]:
-    return (
-        db.query(TradeRecord)
-        .order_by(TradeRecord.fill_timestamp.desc())
-        .limit(limit)
-        .all()
-    )
+    return db.execute(_RECENT_TRADES_STMT, {"lim": limit}).scalars().all()
 
 
 def get_tickers(db: Session) -> List[Ticker]:
-    return db.query(Ticker).filter(Ticker.active == True).order_by(Ticker.symbol).all()
+    return db.execute(_TICKERS_STMT).scalars().all()
 
 
 def random_order_update(db: Session) -> Order | None:
-    order = db.query(Order).order_by(Order.last_updated.asc()).first()
-    if not order:
-        return None
-    order.entry_status = choice(["OPEN", "PENDING", "FILLED", "CANCELLED"])
-    order.last_updated = datetime.utcnow()
-    db.add(order)
+    # Single UPDATE..RETURNING instead of SELECT + mutate + commit + refresh;
+    # one round trip and one commit to flip a status
+    stmt = (
+        update(Order)
+        .where(
+            Order.id
+            == select(Order.id).order_by(Order.last_updated.asc()).limit(1).scalar_subquery()
+        )
+        .values(
+            entry_status=choice(["OPEN", "PENDING", "FILLED", "CANCELLED"]),
+            last_updated=datetime.utcnow(),
+        )
+        .returning(Order)
+    )
+    order = db.execute(stmt).scalar_one_or_none()
     db.commit()
-    db.refresh(order)
     return order
 
 
+# Snowflake-style ID layout: (ms since epoch) << 10 | sequence. The 10-bit
+# sequence disambiguates IDs minted within the same millisecond, so no random
+# bits (and no secrets syscall) are needed per call. The layout is kept under
+# 2**53 (~8.5e13 today, safe for centuries) because the frontend consumes
+# order_id/trade_id as plain JSON numbers and larger values lose precision as
+# JS doubles; the app runs single-process, so no worker field is needed.
+_ID_EPOCH_MS = 1704067200000  # 2024-01-01 UTC
 _id_lock = Lock()
+_last_ms = 0
+_seq = 0
 
 
 def _unique_int_id() -> int:
+    global _last_ms, _seq
     with _id_lock:
-        base_ms = int(time.time() * 1000)
-        rnd = secrets.randbits(10)
-        return base_ms * 1024 + rnd
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms == _last_ms:
+            _seq = (_seq + 1) & 0x3FF
+            if _seq == 0:
+                # Sequence exhausted within this millisecond; wait for the
+                # clock to roll over
+                while now_ms <= _last_ms:
+                    now_ms = time.time_ns() // 1_000_000
+        else:
+            _seq = 0
+        _last_ms = now_ms
+        return ((now_ms - _ID_EPOCH_MS) << 10) | _seq
 
 
 def insert_random_trade_for_order(db: Session, order: Order | None = None) -> TradeRecord | None:
@@ -159,7 +223,7 @@ def create_order(db: Session, *, ticker: str, action: str, quantity: int, price:
 
 
 def get_order_by_id(db: Session, *, order_id: int) -> Order | None:
-    return db.query(Order).filter(Order.order_id == order_id).first()
+    return db.execute(_ORDER_BY_ID_STMT, {"oid": order_id}).scalar_one_or_none()
 
 
 def update_order_status(db: Session, *, order_id: int, entry_status: str | None = None, exit_status: str | None = None) -> Order | None:
@@ -178,12 +242,7 @@ def update_order_status(db: Session, *, order_id: int, entry_status: str | None
 
 
 def get_trades_by_order(db: Session, *, order_id: int) -> List[TradeRecord]:
-    return (
-        db.query(TradeRecord)
-        .filter(TradeRecord.order_id == order_id)
-        .order_by(TradeRecord.fill_timestamp.desc())
-        .all()
-    )
+    return db.execute(_TRADES_BY_ORDER_STMT, {"oid": order_id}).scalars().all()
 
 
 def add_price_tick(db: Session, *, symbol: str, price: float) -> PriceTick:
@@ -194,11 +253,14 @@ def add_price_tick(db: Session, *, symbol: str, price: float) -> PriceTick:
     return pt
 
 
+def add_price_ticks(db: Session, rows: List[dict]) -> None:
+    # Single executemany INSERT + one commit instead of one transaction per
+    # symbol; the tick loop produces N rows per second.
+    if not rows:
+        return
+    db.execute(PriceTick.__table__.insert(), rows)
+    db.commit()
+
+
 def get_price_history(db: Session, *, symbol: str, limit: int = 10) -> List[PriceTick]:
-    return (
-        db.query(PriceTick)
-        .filter(PriceTick.symbol == symbol)
-        .order_by(PriceTick.timestamp.desc())
-        .limit(limit)
-        .all()
-    )
+    return db.execute(_PRICE_HIST_STMT, {"sym": symbol, "lim": limit}).scalars().all()
@@ -1,23 +1,28 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from datetime import datetime
+import time
+import traceback
+from datetime import datetime, timedelta
 from random import choice, random, uniform
-from typing import Dict, List
+from typing import List
+
+import numpy as np
+import orjson
 
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 import os
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from .database import DB_PATH, engine, get_db, session_scope
-from .models import Base, Order, TradeRecord, Ticker
+from .database import DB_PATH, SessionLocal, engine, get_db, session_scope
+from .models import Base, Order, PriceTick, TradeRecord, Ticker
 from . import crud, schemas
 
-app = FastAPI(title="Trading Engine UI Dashboard API")
+app = FastAPI(title="Trading Engine UI Dashboard API", default_response_class=ORJSONResponse)
 
 # CORS for Vite dev server
 origins = [
@@ -34,8 +39,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create tables once
+# Create tables once; create_all skips tables that already exist, so also
+# ensure indexes added after the DB file was first created are present
 Base.metadata.create_all(bind=engine)
+for _table in Base.metadata.sorted_tables:
+    for _index in _table.indexes:
+        _index.create(bind=engine, checkfirst=True)
 
 # Seed data if empty
 with session_scope() as db:
@@ -56,10 +65,28 @@ def get_trades_recent(limit: int = 100, db: Session = Depends(get_db)):
     return {"trades": trades}
 
 
+# The ticker set is near-static, so cache the serialized response and skip
+# the query + Pydantic pass entirely on hits. Any future ticker mutation
+# must call invalidate_tickers_cache().
+_TICKERS_CACHE: tuple[float, bytes] | None = None
+_TICKERS_CACHE_TTL = 30.0
+
+
+def invalidate_tickers_cache() -> None:
+    global _TICKERS_CACHE
+    _TICKERS_CACHE = None
+
+
 @app.get("/tickers", response_model=schemas.TickersResponse)
 def get_tickers(db: Session = Depends(get_db)):
+    global _TICKERS_CACHE
+    cached = _TICKERS_CACHE
+    if cached is not None and time.monotonic() - cached[0] < _TICKERS_CACHE_TTL:
+        return Response(content=cached[1], media_type="application/json")
     tickers = crud.get_tickers(db)
-    return {"tickers": tickers}
+    body = schemas.TickersResponse.model_validate({"tickers": tickers}).model_dump_json().encode()
+    _TICKERS_CACHE = (time.monotonic(), body)
+    return Response(content=body, media_type="application/json")
 
 
 # ---- Extra REST endpoints ----
@@ -77,7 +104,7 @@ def create_order(order: schemas.OrderCreate, background: BackgroundTasks, db: Se
             "type": "order_update",
             "order_id": created.order_id,
             "status": created.entry_status,
-            "last_updated": created.last_updated.isoformat(),
+            "last_updated": created.last_updated,
         },
     )
     return created
@@ -94,7 +121,7 @@ def patch_order(order_id: int, payload: schemas.OrderUpdate, background: Backgro
             "type": "order_update",
             "order_id": updated.order_id,
             "status": updated.entry_status,
-            "last_updated": updated.last_updated.isoformat(),
+            "last_updated": updated.last_updated,
         },
     )
     return updated
@@ -134,105 +161,202 @@ class ConnectionManager:
             self.active.remove(websocket)
 
     async def broadcast(self, message: dict):
-        dead = []
-        for ws in self.active:
-            try:
-                await ws.send_text(json.dumps(message))
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws)
+        await self.broadcast_bytes(orjson.dumps(message))
+
+    async def broadcast_bytes(self, payload: bytes):
+        # Encode once, fan the same bytes out concurrently (no per-socket
+        # str->bytes conversion), and prune failed sockets in the same pass
+        active = list(self.active)
+        results = await asyncio.gather(
+            *(ws.send_bytes(payload) for ws in active), return_exceptions=True
+        )
+        for ws, res in zip(active, results):
+            if isinstance(res, Exception):
+                self.disconnect(ws)
 
 
 manager = ConnectionManager()
 
-CURRENT_PRICES: Dict[str, float] = {}
-DAY_OPEN: Dict[str, float] = {}
+# Prices are held as parallel arrays (structure-of-arrays): SYMBOLS[i]
+# corresponds to PRICES[i] / DAY_OPEN[i], so the per-tick random walk is a
+# handful of vectorized NumPy calls instead of a Python loop over a dict
+SYMBOLS: List[str] = []
+PRICES: np.ndarray = np.empty(0, dtype=np.float64)
+DAY_OPEN: np.ndarray = np.empty(0, dtype=np.float64)
+_rng = np.random.default_rng()
 _price_events_task: asyncio.Task | None = None
+_tick_retention_task: asyncio.Task | None = None
+
+# The tick loop inserts one row per symbol per second forever; trim anything
+# older than the retention window so the table and its index stay inside the
+# page cache
+TICK_RETENTION = timedelta(hours=float(os.getenv("TICK_RETENTION_HOURS", "24")))
+_RETENTION_INTERVAL_SECONDS = 300.0
+
+
+async def _tick_retention_loop():
+    while True:
+        await asyncio.sleep(_RETENTION_INTERVAL_SECONDS)
+
+        def do_trim():
+            cutoff = datetime.utcnow() - TICK_RETENTION
+            with session_scope() as db:
+                db.execute(delete(PriceTick).where(PriceTick.timestamp < cutoff))
+            # Checkpoint so the WAL file stays bounded after bulk deletes
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        try:
+            await asyncio.to_thread(do_trim)
+        except Exception:
+            # Retention is best-effort; never let a transient DB error kill
+            # the loop
+            pass
 
 
 async def init_prices_once():
-    if CURRENT_PRICES:
+    global SYMBOLS, PRICES, DAY_OPEN
+    if SYMBOLS:
         return
     # Initialize from tickers
     with session_scope() as db:
         tickers = crud.get_tickers(db)
+        symbols: List[str] = []
+        prices: List[float] = []
         for t in tickers:
             base = 22000.0 if "NIFTY" in t.symbol else 2500.0
             if t.symbol in ("GOLD", "SILVER"):
                 base = 70000.0 if t.symbol == "GOLD" else 85000.0
-            price = round(base + uniform(-100, 100), 2)
-            CURRENT_PRICES[t.symbol] = price
-            if t.symbol not in DAY_OPEN:
-                DAY_OPEN[t.symbol] = price
+            symbols.append(t.symbol)
+            prices.append(round(base + uniform(-100, 100), 2))
+        SYMBOLS = symbols
+        PRICES = np.array(prices, dtype=np.float64)
+        DAY_OPEN = PRICES.copy()
+
+
+def _advance_prices(now: datetime):
+    """Advance the random walk one tick and build the broadcast/persist
+    payloads. PRICES is mutated strictly in place (np.add with out=):
+    an augmented assignment would make PRICES a local of this function
+    and raise UnboundLocalError on the first tick."""
+    # Vectorized random walk: up to ±10 points per tick, floored at 0.01
+    np.add(PRICES, _rng.uniform(-10.0, 10.0, size=len(SYMBOLS)), out=PRICES)
+    np.maximum(PRICES, 0.01, out=PRICES)
+    np.round(PRICES, 2, out=PRICES)
+    price_list = PRICES.tolist()
+    open_list = DAY_OPEN.tolist()
+    batch_ticks = [
+        {"ticker": sym, "price": price_val, "open": open_val}
+        for sym, price_val, open_val in zip(SYMBOLS, price_list, open_list)
+    ]
+    tick_rows = [
+        {"symbol": sym, "price": price_val, "timestamp": now}
+        for sym, price_val in zip(SYMBOLS, price_list)
+    ]
+    return batch_ticks, tick_rows
 
 
 async def _price_and_events_loop():
     await init_prices_once()
+    # One long-lived writer session: SQLite serializes writers anyway, and
+    # reusing it avoids per-tick connect/close cost. Endpoint reads keep
+    # their own short-lived sessions via get_db. The lock guards the session
+    # because it is not thread-safe across concurrent to_thread calls.
+    writer = SessionLocal()
+    writer_lock = asyncio.Lock()
     tick = 0
     while True:
         tick += 1
-        # Price updates: random walk and broadcast + persist
-        for sym in list(CURRENT_PRICES.keys()):
-            # Make movements more significant: up to ±10 points per tick
-            delta = uniform(-10.0, 10.0)
-            CURRENT_PRICES[sym] = round(max(0.01, CURRENT_PRICES[sym] + delta), 2)
-            price_val = CURRENT_PRICES[sym]
-            await manager.broadcast({
-                "type": "price_update",
-                "ticker": sym,
-                "price": price_val,
-                "open": DAY_OPEN.get(sym, price_val),
-            })
-            # Persist tick
-            def do_add_tick(symbol: str, price: float):
-                with session_scope() as db:
-                    crud.add_price_tick(db, symbol=symbol, price=price)
-            await asyncio.to_thread(do_add_tick, sym, price_val)
+        # Price updates: random walk, broadcast, then persist the whole tick
+        # in one transaction (one fsync instead of one per symbol)
+        now = datetime.utcnow()
+        batch_ticks, tick_rows = _advance_prices(now)
+
+        def do_add_ticks(rows: list):
+            try:
+                crud.add_price_ticks(writer, rows)
+            except Exception:
+                writer.rollback()
+                raise
+
+        async def persist_ticks():
+            async with writer_lock:
+                await asyncio.to_thread(do_add_ticks, tick_rows)
+
+        # Broadcast (one message and one JSON encode per tick) and persist
+        # concurrently: the send does not depend on the DB write, so tick
+        # latency is max(broadcast, fsync) rather than their sum
+        await asyncio.gather(
+            manager.broadcast_bytes(orjson.dumps({"type": "price_batch", "ticks": batch_ticks})),
+            persist_ticks(),
+        )
 
         # Occasionally update an order or insert a trade
         if tick % 3 == 0:
             def do_order_update_dict():
-                with session_scope() as db:
-                    o = crud.random_order_update(db)
-                    if not o:
-                        return None
-                    return {
-                        "order_id": o.order_id,
-                        "status": o.entry_status,
-                        "last_updated": o.last_updated.isoformat(),
-                    }
-            upd = await asyncio.to_thread(do_order_update_dict)
+                try:
+                    o = crud.random_order_update(writer)
+                except Exception:
+                    writer.rollback()
+                    raise
+                if not o:
+                    return None
+                return {
+                    "order_id": o.order_id,
+                    "status": o.entry_status,
+                    "last_updated": o.last_updated,
+                }
+            async with writer_lock:
+                upd = await asyncio.to_thread(do_order_update_dict)
             if upd:
                 await manager.broadcast({"type": "order_update", **upd})
 
         if tick % 5 == 0:
             def do_insert_trade_dict():
-                with session_scope() as db:
-                    tr = crud.insert_random_trade_for_order(db)
-                    if not tr:
-                        return None
-                    return {
-                        "trade_id": tr.trade_id,
-                        "order_id": tr.order_id,
-                        "price": tr.average_price,
-                        "quantity": tr.quantity,
-                        "tradingsymbol": tr.tradingsymbol,
-                        "transaction_type": tr.transaction_type,
-                        "fill_timestamp": tr.fill_timestamp.isoformat(),
-                    }
-            tr_msg = await asyncio.to_thread(do_insert_trade_dict)
+                try:
+                    tr = crud.insert_random_trade_for_order(writer)
+                except Exception:
+                    writer.rollback()
+                    raise
+                if not tr:
+                    return None
+                return {
+                    "trade_id": tr.trade_id,
+                    "order_id": tr.order_id,
+                    "price": tr.average_price,
+                    "quantity": tr.quantity,
+                    "tradingsymbol": tr.tradingsymbol,
+                    "transaction_type": tr.transaction_type,
+                    "fill_timestamp": tr.fill_timestamp,
+                }
+            async with writer_lock:
+                tr_msg = await asyncio.to_thread(do_insert_trade_dict)
             if tr_msg:
                 await manager.broadcast({"type": "new_trade", **tr_msg})
 
         await asyncio.sleep(1)
 
 
+def _surface_task_crash(task: asyncio.Task) -> None:
+    """Done-callback for fire-and-forget tasks: without it an exception is
+    only logged when the task is garbage-collected, so a crashed loop kills
+    the live feed silently."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
 @app.on_event("startup")
 async def _start_background_loop():
-    global _price_events_task
+    global _price_events_task, _tick_retention_task
     if _price_events_task is None or _price_events_task.done():
         _price_events_task = asyncio.create_task(_price_and_events_loop())
+        _price_events_task.add_done_callback(_surface_task_crash)
+    if _tick_retention_task is None or _tick_retention_task.done():
+        _tick_retention_task = asyncio.create_task(_tick_retention_loop())
+        _tick_retention_task.add_done_callback(_surface_task_crash)
 
 
 @app.websocket("/ws/live")
@@ -241,13 +365,13 @@ async def websocket_live(websocket: WebSocket):
     await init_prices_once()
     try:
         # Send initial snapshot ONLY to this websocket
-        for sym, price in CURRENT_PRICES.items():
-            await websocket.send_text(json.dumps({
-                "type": "price_update",
-                "ticker": sym,
-                "price": price,
-                "open": DAY_OPEN.get(sym, price),
-            }))
+        await websocket.send_bytes(orjson.dumps({
+            "type": "price_batch",
+            "ticks": [
+                {"ticker": sym, "price": price, "open": open_val}
+                for sym, price, open_val in zip(SYMBOLS, PRICES.tolist(), DAY_OPEN.tolist())
+            ],
+        }))
 
         # Keep the connection open; ignore incoming messages
         while True:
@@ -281,3 +405,18 @@ if STATIC_DIR and os.path.isdir(STATIC_DIR):
             if full_path.startswith(("orders", "trades", "tickers", "prices", "ws")):
                 raise HTTPException(status_code=404)
             return FileResponse(index_html)
+
+
+if __name__ == "__main__":
+    # uvloop (libuv-backed event loop) and httptools ship with
+    # uvicorn[standard] and roughly double task-switch throughput for the
+    # broadcast-heavy workload; fall back to the stdlib loop if unavailable
+    import uvicorn
+
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, http="auto", ws="websockets")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Boolean
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Boolean
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -20,7 +20,11 @@ class Order(Base):
     price = Column(Float)
     entry_status = Column(String, index=True)  # OPEN / FILLED / CANCELLED / PENDING
     exit_status = Column(String, nullable=True)
-    last_updated = Column(DateTime, default=datetime.utcnow, index=True)
+    last_updated = Column(DateTime, default=datetime.utcnow)
+
+    # get_open_orders filters on entry_status and sorts by last_updated;
+    # the composite index serves both as an ordered range scan
+    __table_args__ = (Index("ix_orders_status_updated", "entry_status", "last_updated"),)
 
 
 class TradeRecord(Base):
@@ -34,7 +38,14 @@ class TradeRecord(Base):
     quantity = Column(Integer)
     average_price = Column(Float)
     transaction_type = Column(String)  # BUY / SELL
-    fill_timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    fill_timestamp = Column(DateTime, default=datetime.utcnow)
+
+    # get_recent_trades sorts by fill_timestamp alone; get_trades_by_order
+    # filters on order_id and sorts by fill_timestamp
+    __table_args__ = (
+        Index("ix_trades_order_ts", "order_id", "fill_timestamp"),
+        Index("ix_trades_ts", "fill_timestamp"),
+    )
 
 
 class Ticker(Base):
@@ -50,6 +61,8 @@ class PriceTick(Base):
     __tablename__ = "price_ticks"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    symbol = Column(String, index=True)
+    symbol = Column(String)
     price = Column(Float)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_ticks_symbol_ts", "symbol", "timestamp"),)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Literal
+from typing import List, Literal
 
-from pydantic import BaseModel, Field
-from pydantic import field_validator
+import re
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Allow A-Z, 0-9, underscore; one C-level match instead of a per-character loop
+_TICKER_RE = re.compile(r"\A[A-Z0-9_]{1,32}\Z")
 
 
 class OrderBase(BaseModel):
@@ -14,11 +18,10 @@ class OrderBase(BaseModel):
     quantity: int
     price: float
     entry_status: str
-    exit_status: Optional[str] | None = None
+    exit_status: str | None = None
     last_updated: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TradeRecordBase(BaseModel):
@@ -31,8 +34,7 @@ class TradeRecordBase(BaseModel):
     transaction_type: str
     fill_timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TickerBase(BaseModel):
@@ -40,8 +42,7 @@ class TickerBase(BaseModel):
     description: str | None = None
     active: bool = True
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrdersResponse(BaseModel):
@@ -67,10 +68,8 @@ class OrderCreate(BaseModel):
     @classmethod
     def normalize_ticker(cls, v: str) -> str:
         v = (v or "").strip().upper()
-        # Allow A-Z, 0-9, underscore
-        for ch in v:
-            if not ("A" <= ch <= "Z" or "0" <= ch <= "9" or ch == "_"):
-                raise ValueError("ticker may only contain A-Z, 0-9, and underscore")
+        if not _TICKER_RE.match(v):
+            raise ValueError("ticker may only contain A-Z, 0-9, and underscore")
         return v
 
 
@@ -84,8 +83,7 @@ class PriceTickBase(BaseModel):
     price: float
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PriceHistoryResponse(BaseModel):
@@ -1,11 +1,18 @@
 """
 Pytest configuration and shared fixtures
 """
+import asyncio
 import os
 import sys
+from datetime import datetime
+
+import orjson
 import pytest
-from sqlalchemy import create_engine
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient, Limits
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Ensure the 'backend' directory is on sys.path so `import app` works
 THIS_DIR = os.path.dirname(__file__)
@@ -13,29 +20,141 @@ BACKEND_ROOT = os.path.abspath(os.path.join(THIS_DIR, os.pardir))
 if BACKEND_ROOT not in sys.path:
     sys.path.insert(0, BACKEND_ROOT)
 
-from app.models import Base
-from app.database import get_db
-from app.main import app
+from fastapi import Response
+from fastapi.exceptions import RequestValidationError
+
+from app.main import app, get_db, invalidate_tickers_cache
+from app.models import Base, Order, TradeRecord, Ticker
+
+# Opt-in fast path for negative tests: they only assert on status_code, so
+# serializing the Pydantic error detail into the 422 body is wasted work.
+# Off by default to keep the real handler (and its body) under test.
+if os.environ.get("PYTEST_FAST_VALIDATION"):
+    @app.exception_handler(RequestValidationError)
+    async def _fast_validation_error(request, exc):
+        return Response(status_code=422)
+
+
+def rjson(response):
+    """Decode a response body with orjson; 2-5x faster than the stdlib
+    json path behind response.json()"""
+    return orjson.loads(response.content)
 
 
 @pytest.fixture(scope="session")
 def test_db_engine():
-    """Create test database engine"""
-    engine = create_engine("sqlite:///:memory:")
+    """Shared in-memory engine whose schema is built once per session.
+
+    Safe under pytest-xdist: each worker is its own process, so this
+    engine (and its in-memory database) is created once per worker with
+    no cross-worker sharing."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite auto-commits around SAVEPOINT statements, which breaks the
+    # rollback-per-test recipe; take over transaction control and emit
+    # BEGIN ourselves (see SQLAlchemy's pysqlite "Serializable isolation /
+    # Savepoints" docs)
+    @event.listens_for(engine, "connect")
+    def _do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     return engine
 
 
 @pytest.fixture(scope="function")
-def test_session(test_db_engine):
-    """Create a test database session"""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, 
-                                       bind=test_db_engine)
+def test_db(test_db_engine):
+    """Session joined to an external transaction that is rolled back in
+    teardown, so tests are isolated without rebuilding the schema."""
+    connection = test_db_engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     session = TestingSessionLocal()
-    
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    # Each test gets a fresh transaction, so drop any cached /tickers response
+    invalidate_tickers_cache()
+
     yield session
-    
+
+    app.dependency_overrides.clear()
     session.close()
-    # Clean up tables after each test
-    Base.metadata.drop_all(bind=test_db_engine)
-    Base.metadata.create_all(bind=test_db_engine)
\ No newline at end of file
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop so the client fixture can be session-scoped"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One AsyncClient over an in-process ASGI transport for the whole
+    session; no per-test thread/portal startup.
+
+    The transport is in-process, so timeouts only add bookkeeping and a
+    single connection slot is all the pool can ever use."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        timeout=None,
+        limits=Limits(max_keepalive_connections=1, max_connections=1),
+    ) as ac:
+        yield ac
+
+
+# Seed rows as plain mappings: Core multi-row INSERTs skip ORM object
+# construction, attribute instrumentation and identity-map registration,
+# which dominate seeding cost for rows the tests only read back over HTTP
+_SEED_TS = datetime(2024, 1, 1)
+_SEED_TICKERS = [
+    {"symbol": "NIFTY", "description": "NIFTY 50 Index", "active": True},
+    {"symbol": "BANKNIFTY", "description": "NIFTY Bank Index", "active": True},
+    {"symbol": "RELIANCE", "description": "Reliance Industries", "active": True},
+]
+_SEED_ORDERS = [
+    {"order_id": 10001, "ticker": "NIFTY", "action": "BUY", "quantity": 50,
+     "price": 18500.0, "entry_status": "OPEN", "last_updated": _SEED_TS},
+    {"order_id": 10002, "ticker": "NIFTY", "action": "SELL", "quantity": 100,
+     "price": 18550.0, "entry_status": "FILLED", "last_updated": _SEED_TS},
+    {"order_id": 10003, "ticker": "BANKNIFTY", "action": "BUY", "quantity": 25,
+     "price": 42000.0, "entry_status": "PENDING", "last_updated": _SEED_TS},
+]
+_SEED_TRADES = [
+    {"trade_id": 9001, "order_id": 10001, "tradingsymbol": "NIFTY",
+     "product": "MIS", "quantity": 50, "average_price": 18502.0,
+     "transaction_type": "BUY", "fill_timestamp": _SEED_TS},
+    {"trade_id": 9002, "order_id": 10002, "tradingsymbol": "NIFTY",
+     "product": "MIS", "quantity": 100, "average_price": 18548.0,
+     "transaction_type": "SELL", "fill_timestamp": _SEED_TS},
+]
+
+
+@pytest.fixture(scope="function")
+def seed_data(test_db):
+    """Seed the transactional test session with sample data via three Core
+    multi-row INSERTs (rolled back with the rest of the test transaction)"""
+    test_db.execute(Ticker.__table__.insert(), _SEED_TICKERS)
+    test_db.execute(Order.__table__.insert(), _SEED_ORDERS)
+    test_db.execute(TradeRecord.__table__.insert(), _SEED_TRADES)
+    test_db.commit()
@@ -1,92 +1,33 @@
 """
 Comprehensive test suite for Trading Dashboard API
 Run with: pytest backend/tests/ -v
+
+Shared fixtures (client, test_db, seed_data) live in conftest.py.
 """
+import numpy as np
 import pytest
-import json
 from datetime import datetime
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.orm import sessionmaker
 
-from app.main import app, get_db
-from app.models import Base, Order, TradeRecord, Ticker, PriceTick
-from app.database import DB_PATH
+from conftest import rjson
 
+from app import main
+from app.models import PriceTick, Ticker
 
-# ============================================================================
-# FIXTURES & SETUP
-# ============================================================================
+# Required response fields, as module-level frozensets so schema tests do a
+# single C-level subset check instead of rebuilding a list per run
+ORDER_FIELDS = frozenset({"order_id", "ticker", "action", "quantity",
+                          "price", "entry_status", "last_updated"})
+TRADE_FIELDS = frozenset({"trade_id", "order_id", "tradingsymbol",
+                          "quantity", "average_price", "transaction_type"})
+TICKER_FIELDS = frozenset({"symbol", "active"})
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create a fresh test database for each test"""
-    # Use in-memory SQLite for testing
-    # Use a shared in-memory SQLite DB across connections
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    Base.metadata.create_all(bind=engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    def override_get_db():
-        db = TestingSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-    
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestingSessionLocal()
-    app.dependency_overrides.clear()
-
-
-@pytest.fixture(scope="function")
-def client(test_db):
-    """Create a test client"""
-    return TestClient(app)
-
-
-@pytest.fixture(scope="function")
-def seed_data(test_db):
-    """Seed test database with sample data"""
-    # Create tickers
-    tickers = [
-        Ticker(symbol="NIFTY", description="NIFTY 50 Index", active=True),
-        Ticker(symbol="BANKNIFTY", description="NIFTY Bank Index", active=True),
-        Ticker(symbol="RELIANCE", description="Reliance Industries", active=True),
-    ]
-    test_db.add_all(tickers)
-    test_db.commit()
-    
-    # Create orders
-    orders = [
-        Order(order_id=10001, ticker="NIFTY", action="BUY", quantity=50, 
-              price=18500.0, entry_status="OPEN", last_updated=datetime.utcnow()),
-        Order(order_id=10002, ticker="NIFTY", action="SELL", quantity=100, 
-              price=18550.0, entry_status="FILLED", last_updated=datetime.utcnow()),
-        Order(order_id=10003, ticker="BANKNIFTY", action="BUY", quantity=25, 
-              price=42000.0, entry_status="PENDING", last_updated=datetime.utcnow()),
-    ]
-    test_db.add_all(orders)
-    test_db.commit()
-    
-    # Create trades
-    trades = [
-        TradeRecord(trade_id=9001, order_id=10001, tradingsymbol="NIFTY", 
-                   product="MIS", quantity=50, average_price=18502.0, 
-                   transaction_type="BUY", fill_timestamp=datetime.utcnow()),
-        TradeRecord(trade_id=9002, order_id=10002, tradingsymbol="NIFTY", 
-                   product="MIS", quantity=100, average_price=18548.0, 
-                   transaction_type="SELL", fill_timestamp=datetime.utcnow()),
-    ]
-    test_db.add_all(trades)
-    test_db.commit()
-    
-    return {"tickers": tickers, "orders": orders, "trades": trades}
+# Immutable request payloads shared across tests; the client serializes
+# without mutating, so no per-test copy is needed
+BASE_ORDER_PAYLOAD = {"ticker": "NIFTY", "action": "BUY", "quantity": 50, "price": 18600.0}
+
+# Fixed timestamp for seeded price ticks; the history tests only count rows,
+# so a sentinel avoids a wall-clock syscall per test
+SENTINEL_TS = datetime(2024, 1, 1)
 
 
 # ============================================================================
@@ -96,32 +37,32 @@ def seed_data(test_db):
 class TestGetOrdersOpen:
     """Test suite for GET /orders/open endpoint"""
     
-    def test_get_orders_open_success(self, client, seed_data):
+    async def test_get_orders_open_success(self, client, seed_data):
         """Should return list of open and pending orders"""
-        response = client.get("/orders/open")
+        response = await client.get("/orders/open")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "orders" in data
         assert len(data["orders"]) >= 2  # At least OPEN and PENDING orders
     
-    def test_get_orders_open_returns_correct_statuses(self, client, seed_data):
+    async def test_get_orders_open_returns_correct_statuses(self, client, seed_data):
         """Should only return OPEN and PENDING status orders"""
-        response = client.get("/orders/open")
-        data = response.json()
-        statuses = [order["entry_status"] for order in data["orders"]]
-        assert all(status in ["OPEN", "PENDING"] for status in statuses)
+        response = await client.get("/orders/open")
+        data = rjson(response)
+        statuses = {order["entry_status"] for order in data["orders"]}
+        assert statuses <= {"OPEN", "PENDING"}
     
-    def test_get_orders_open_empty_database(self, client, test_db):
+    async def test_get_orders_open_empty_database(self, client, test_db):
         """Should return empty list when no orders exist"""
-        response = client.get("/orders/open")
+        response = await client.get("/orders/open")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["orders"] == []
     
-    def test_get_orders_open_ordering(self, client, seed_data):
+    async def test_get_orders_open_ordering(self, client, seed_data):
         """Should return orders ordered by last_updated descending"""
-        response = client.get("/orders/open")
-        data = response.json()
+        response = await client.get("/orders/open")
+        data = rjson(response)
         if len(data["orders"]) > 1:
             timestamps = [order["last_updated"] for order in data["orders"]]
             # Verify descending order
@@ -135,34 +76,34 @@ class TestGetOrdersOpen:
 class TestGetTradesRecent:
     """Test suite for GET /trades/recent endpoint"""
     
-    def test_get_trades_recent_success(self, client, seed_data):
+    async def test_get_trades_recent_success(self, client, seed_data):
         """Should return list of recent trades"""
-        response = client.get("/trades/recent")
+        response = await client.get("/trades/recent")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "trades" in data
         assert isinstance(data["trades"], list)
     
-    def test_get_trades_recent_limit(self, client, seed_data):
+    async def test_get_trades_recent_limit(self, client, seed_data):
         """Should respect limit parameter"""
-        response = client.get("/trades/recent?limit=1")
+        response = await client.get("/trades/recent?limit=1")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert len(data["trades"]) <= 1
     
-    def test_get_trades_recent_ordering(self, client, seed_data):
+    async def test_get_trades_recent_ordering(self, client, seed_data):
         """Should return trades ordered by fill_timestamp descending"""
-        response = client.get("/trades/recent")
-        data = response.json()
+        response = await client.get("/trades/recent")
+        data = rjson(response)
         if len(data["trades"]) > 1:
             timestamps = [trade["fill_timestamp"] for trade in data["trades"]]
             assert timestamps == sorted(timestamps, reverse=True)
     
-    def test_get_trades_recent_empty_database(self, client, test_db):
+    async def test_get_trades_recent_empty_database(self, client, test_db):
         """Should return empty list when no trades exist"""
-        response = client.get("/trades/recent")
+        response = await client.get("/trades/recent")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["trades"] == []
 
 
@@ -173,31 +114,31 @@ class TestGetTradesRecent:
 class TestGetTickers:
     """Test suite for GET /tickers endpoint"""
     
-    def test_get_tickers_success(self, client, seed_data):
+    async def test_get_tickers_success(self, client, seed_data):
         """Should return list of active tickers"""
-        response = client.get("/tickers")
+        response = await client.get("/tickers")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "tickers" in data
         assert len(data["tickers"]) == 3
     
-    def test_get_tickers_only_active(self, client, test_db):
+    async def test_get_tickers_only_active(self, client, test_db):
         """Should only return active tickers"""
         # Add inactive ticker
         test_db.add(Ticker(symbol="GOLD", description="Gold Futures", active=False))
         test_db.add(Ticker(symbol="SILVER", description="Silver Futures", active=True))
         test_db.commit()
         
-        response = client.get("/tickers")
-        data = response.json()
+        response = await client.get("/tickers")
+        data = rjson(response)
         symbols = [t["symbol"] for t in data["tickers"]]
         assert "GOLD" not in symbols
         assert "SILVER" in symbols
     
-    def test_get_tickers_ordering(self, client, seed_data):
+    async def test_get_tickers_ordering(self, client, seed_data):
         """Should return tickers ordered by symbol"""
-        response = client.get("/tickers")
-        data = response.json()
+        response = await client.get("/tickers")
+        data = rjson(response)
         symbols = [t["symbol"] for t in data["tickers"]]
         assert symbols == sorted(symbols)
 
@@ -206,129 +147,103 @@ class TestGetTickers:
 # TEST: POST /orders
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestCreateOrder:
     """Test suite for POST /orders endpoint"""
     
-    def test_create_order_success(self, client, seed_data):
+    async def test_create_order_success(self, client):
         """Should create a new order"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "BUY",
-            "quantity": 50,
-            "price": 18600.0
-        }
-        response = client.post("/orders", json=payload)
+        response = await client.post("/orders", json=BASE_ORDER_PAYLOAD)
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["ticker"] == "NIFTY"
         assert data["action"] == "BUY"
         assert data["quantity"] == 50
         assert data["price"] == 18600.0
         assert data["entry_status"] == "OPEN"
     
-    def test_create_order_invalid_quantity(self, client, seed_data):
-        """Should reject negative quantity"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "BUY",
-            "quantity": -50,
-            "price": 18600.0
-        }
-        response = client.post("/orders", json=payload)
-        # Should fail validation or be rejected
-        assert response.status_code in [400, 422]
-    
-    def test_create_order_invalid_price(self, client, seed_data):
-        """Should reject negative price"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "BUY",
-            "quantity": 50,
-            "price": -18600.0
-        }
-        response = client.post("/orders", json=payload)
-        assert response.status_code in [400, 422]
-    
-    def test_create_order_invalid_action(self, client, seed_data):
-        """Should reject invalid action"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "INVALID",
-            "quantity": 50,
-            "price": 18600.0
-        }
-        response = client.post("/orders", json=payload)
-        assert response.status_code in [400, 422]
-    
-    def test_create_order_missing_fields(self, client, seed_data):
-        """Should reject request with missing fields"""
-        payload = {"ticker": "NIFTY", "action": "BUY"}  # Missing quantity and price
-        response = client.post("/orders", json=payload)
-        assert response.status_code == 422
+    @pytest.mark.parametrize(
+        "payload,expected",
+        [
+            pytest.param(
+                {"ticker": "NIFTY", "action": "BUY", "quantity": -50, "price": 18600.0},
+                (400, 422), id="negative-quantity"),
+            pytest.param(
+                {"ticker": "NIFTY", "action": "BUY", "quantity": 0, "price": 18600.0},
+                (400, 422), id="zero-quantity"),
+            pytest.param(
+                {"ticker": "NIFTY", "action": "BUY", "quantity": 50, "price": -18600.0},
+                (400, 422), id="negative-price"),
+            pytest.param(
+                {"ticker": "NIFTY", "action": "INVALID", "quantity": 50, "price": 18600.0},
+                (400, 422), id="invalid-action"),
+            pytest.param(
+                {"ticker": "NIFTY", "action": "BUY"},  # Missing quantity and price
+                (422,), id="missing-fields"),
+        ],
+    )
+    async def test_create_order_rejects_invalid(self, client, payload, expected):
+        """Should reject invalid payloads with a validation error"""
+        response = await client.post("/orders", json=payload)
+        assert response.status_code in expected
 
 
 # ============================================================================
 # TEST: GET /orders/{order_id}
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestGetOrderById:
     """Test suite for GET /orders/{order_id} endpoint"""
     
-    def test_get_order_by_id_success(self, client, seed_data):
+    async def test_get_order_by_id_success(self, client):
         """Should return order by ID"""
-        response = client.get("/orders/10001")
+        response = await client.get("/orders/10001")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["order_id"] == 10001
         assert data["ticker"] == "NIFTY"
     
-    def test_get_order_by_id_not_found(self, client, seed_data):
+    async def test_get_order_by_id_not_found(self, client):
         """Should return 404 for non-existent order"""
-        response = client.get("/orders/99999")
+        response = await client.get("/orders/99999")
         assert response.status_code == 404
     
-    def test_get_order_by_id_invalid_id(self, client, seed_data):
+    async def test_get_order_by_id_invalid_id(self, client):
         """Should handle invalid order ID format"""
-        response = client.get("/orders/invalid")
-        assert response.status_code in [400, 404, 422]
+        response = await client.get("/orders/invalid")
+        assert response.status_code in (400, 404, 422)
 
 
 # ============================================================================
 # TEST: PATCH /orders/{order_id}
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestUpdateOrder:
     """Test suite for PATCH /orders/{order_id} endpoint"""
     
-    def test_update_order_entry_status(self, client, seed_data):
-        """Should update order entry status"""
-        payload = {"entry_status": "FILLED"}
-        response = client.patch("/orders/10001", json=payload)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["entry_status"] == "FILLED"
-    
-    def test_update_order_exit_status(self, client, seed_data):
-        """Should update order exit status"""
-        payload = {"exit_status": "COMPLETED"}
-        response = client.patch("/orders/10001", json=payload)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["exit_status"] == "COMPLETED"
-    
-    def test_update_order_both_statuses(self, client, seed_data):
-        """Should update both entry and exit status"""
-        payload = {"entry_status": "FILLED", "exit_status": "COMPLETED"}
-        response = client.patch("/orders/10001", json=payload)
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"entry_status": "FILLED"}, id="entry-status"),
+            pytest.param({"exit_status": "COMPLETED"}, id="exit-status"),
+            pytest.param({"entry_status": "FILLED", "exit_status": "COMPLETED"},
+                         id="both-statuses"),
+        ],
+    )
+    async def test_update_order_success(self, client, payload):
+        """Should update the given status fields and echo them back"""
+        response = await client.patch("/orders/10001", json=payload)
         assert response.status_code == 200
-        data = response.json()
-        assert data["entry_status"] == "FILLED"
-        assert data["exit_status"] == "COMPLETED"
+        data = rjson(response)
+        for field, value in payload.items():
+            assert data[field] == value
     
-    def test_update_order_not_found(self, client, seed_data):
+    async def test_update_order_not_found(self, client):
         """Should return 404 for non-existent order"""
         payload = {"entry_status": "FILLED"}
-        response = client.patch("/orders/99999", json=payload)
+        response = await client.patch("/orders/99999", json=payload)
         assert response.status_code == 404
 
 
@@ -336,28 +251,31 @@ class TestUpdateOrder:
 # TEST: GET /trades/by-order/{order_id}
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestGetTradesByOrder:
     """Test suite for GET /trades/by-order/{order_id} endpoint"""
     
-    def test_get_trades_by_order_success(self, client, seed_data):
+    async def test_get_trades_by_order_success(self, client):
         """Should return trades for specific order"""
-        response = client.get("/trades/by-order/10001")
+        response = await client.get("/trades/by-order/10001")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "trades" in data
-        assert all(trade["order_id"] == 10001 for trade in data["trades"])
+        trades = data["trades"]
+        # One set-build pass instead of a per-element generator walk
+        assert not trades or {t["order_id"] for t in trades} == {10001}
     
-    def test_get_trades_by_order_empty(self, client, seed_data):
+    async def test_get_trades_by_order_empty(self, client):
         """Should return empty list if no trades for order"""
-        response = client.get("/trades/by-order/10003")
+        response = await client.get("/trades/by-order/10003")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["trades"] == []
     
-    def test_get_trades_by_order_not_found(self, client, seed_data):
+    async def test_get_trades_by_order_not_found(self, client):
         """Should handle non-existent order"""
-        response = client.get("/trades/by-order/99999")
-        assert response.status_code in [200, 404]
+        response = await client.get("/trades/by-order/99999")
+        assert response.status_code in (200, 404)
 
 
 # ============================================================================
@@ -367,41 +285,43 @@ class TestGetTradesByOrder:
 class TestGetPriceHistory:
     """Test suite for GET /prices/{symbol} endpoint"""
     
-    def test_get_price_history_success(self, client, test_db):
+    async def test_get_price_history_success(self, client, test_db):
         """Should return price history for symbol"""
-        # Add price ticks
+        # Add price ticks; the test only counts them, so a fixed timestamp is fine
         ticks = [
-            PriceTick(symbol="NIFTY", price=18500.0, timestamp=datetime.utcnow()),
-            PriceTick(symbol="NIFTY", price=18510.0, timestamp=datetime.utcnow()),
-            PriceTick(symbol="NIFTY", price=18520.0, timestamp=datetime.utcnow()),
+            PriceTick(symbol="NIFTY", price=18500.0, timestamp=SENTINEL_TS),
+            PriceTick(symbol="NIFTY", price=18510.0, timestamp=SENTINEL_TS),
+            PriceTick(symbol="NIFTY", price=18520.0, timestamp=SENTINEL_TS),
         ]
         test_db.add_all(ticks)
         test_db.commit()
         
-        response = client.get("/prices/NIFTY")
+        response = await client.get("/prices/NIFTY")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "ticks" in data
         assert len(data["ticks"]) == 3
     
-    def test_get_price_history_limit(self, client, test_db):
+    async def test_get_price_history_limit(self, client, test_db):
         """Should respect limit parameter"""
-        # Add many price ticks
-        for i in range(20):
-            test_db.add(PriceTick(symbol="NIFTY", price=18500.0 + i, 
-                                 timestamp=datetime.utcnow()))
+        # Add many price ticks in one multi-row INSERT instead of 20 ORM adds
+        rows = [
+            {"symbol": "NIFTY", "price": 18500.0 + i, "timestamp": SENTINEL_TS}
+            for i in range(20)
+        ]
+        test_db.bulk_insert_mappings(PriceTick, rows)
         test_db.commit()
         
-        response = client.get("/prices/NIFTY?limit=5")
+        response = await client.get("/prices/NIFTY?limit=5")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert len(data["ticks"]) <= 5
     
-    def test_get_price_history_empty(self, client, test_db):
+    async def test_get_price_history_empty(self, client, test_db):
         """Should return empty list if no history"""
-        response = client.get("/prices/UNKNOWN")
+        response = await client.get("/prices/UNKNOWN")
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["ticks"] == []
 
 
@@ -409,31 +329,19 @@ class TestGetPriceHistory:
 # TEST: DATA VALIDATION
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestDataValidation:
     """Test suite for data validation"""
     
-    def test_order_quantity_constraints(self, client, seed_data):
-        """Should validate order quantity constraints"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "BUY",
-            "quantity": 0,  # Invalid: zero quantity
-            "price": 18600.0
-        }
-        response = client.post("/orders", json=payload)
-        assert response.status_code in [400, 422]
-    
-    def test_order_price_precision(self, client, seed_data):
+    # Quantity constraint cases are covered by
+    # TestCreateOrder.test_create_order_rejects_invalid
+
+    async def test_order_price_precision(self, client):
         """Should handle price precision correctly"""
-        payload = {
-            "ticker": "NIFTY",
-            "action": "BUY",
-            "quantity": 50,
-            "price": 18600.99
-        }
-        response = client.post("/orders", json=payload)
+        payload = {**BASE_ORDER_PAYLOAD, "price": 18600.99}
+        response = await client.post("/orders", json=payload)
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["price"] == 18600.99
 
 
@@ -444,15 +352,19 @@ class TestDataValidation:
 class TestErrorHandling:
     """Test suite for error handling"""
     
-    def test_malformed_json(self, client):
+    async def test_malformed_json(self, client):
         """Should handle malformed JSON gracefully"""
-        response = client.post("/orders", data="invalid json", 
-                              headers={"Content-Type": "application/json"})
-        assert response.status_code in [400, 422]
+        response = await client.post("/orders", content=b"invalid json",
+                                     headers={"Content-Type": "application/json"})
+        assert response.status_code in (400, 422)
     
-    def test_http_methods_not_allowed(self, client):
+    @pytest.mark.parametrize(
+        "method,path",
+        [("DELETE", "/tickers"), ("DELETE", "/orders"), ("PUT", "/tickers")],
+    )
+    async def test_http_methods_not_allowed(self, client, method, path):
         """Should reject unsupported HTTP methods"""
-        response = client.delete("/tickers")
+        response = await client.request(method, path)
         assert response.status_code == 405
 
 
@@ -460,32 +372,55 @@ class TestErrorHandling:
 # TEST: RESPONSE SCHEMAS
 # ============================================================================
 
+@pytest.mark.usefixtures("seed_data")
 class TestResponseSchemas:
     """Test suite for response schema validation"""
     
-    def test_order_response_schema(self, client, seed_data):
+    async def test_order_response_schema(self, client):
         """Should return correct order schema"""
-        response = client.get("/orders/10001")
-        data = response.json()
-        required_fields = ["order_id", "ticker", "action", "quantity", 
-                          "price", "entry_status", "last_updated"]
-        assert all(field in data for field in required_fields)
+        response = await client.get("/orders/10001")
+        data = rjson(response)
+        assert ORDER_FIELDS.issubset(data)
     
-    def test_trade_response_schema(self, client, seed_data):
+    async def test_trade_response_schema(self, client):
         """Should return correct trade schema"""
-        response = client.get("/trades/recent")
-        data = response.json()
+        response = await client.get("/trades/recent")
+        data = rjson(response)
         if data["trades"]:
-            trade = data["trades"][0]
-            required_fields = ["trade_id", "order_id", "tradingsymbol", 
-                              "quantity", "average_price", "transaction_type"]
-            assert all(field in trade for field in required_fields)
+            assert TRADE_FIELDS.issubset(data["trades"][0])
     
-    def test_ticker_response_schema(self, client, seed_data):
+    async def test_ticker_response_schema(self, client):
         """Should return correct ticker schema"""
-        response = client.get("/tickers")
-        data = response.json()
+        response = await client.get("/tickers")
+        data = rjson(response)
         if data["tickers"]:
-            ticker = data["tickers"][0]
-            required_fields = ["symbol", "active"]
-            assert all(field in ticker for field in required_fields)
\ No newline at end of file
+            assert TICKER_FIELDS.issubset(data["tickers"][0])
+
+# ============================================================================
+# TEST: PRICE LOOP
+# ============================================================================
+
+class TestPriceLoop:
+    """Regression tests for the background price-tick step"""
+
+    def test_advance_prices_mutates_in_place(self, monkeypatch):
+        """One tick step must mutate PRICES in place and build both payloads
+
+        Guards against the module-global rebinding bug where an augmented
+        assignment made PRICES an unbound local and killed the loop on its
+        first iteration."""
+        monkeypatch.setattr(main, "SYMBOLS", ["NIFTY", "GOLD"])
+        prices = np.array([18500.0, 70000.0])
+        monkeypatch.setattr(main, "PRICES", prices)
+        monkeypatch.setattr(main, "DAY_OPEN", np.array([18450.0, 69900.0]))
+
+        batch_ticks, tick_rows = main._advance_prices(SENTINEL_TS)
+
+        # Mutated strictly in place: the module global is still our array
+        assert main.PRICES is prices
+        assert [t["ticker"] for t in batch_ticks] == ["NIFTY", "GOLD"]
+        assert [r["symbol"] for r in tick_rows] == ["NIFTY", "GOLD"]
+        assert all(r["timestamp"] == SENTINEL_TS for r in tick_rows)
+        # Walk is bounded: ±10 points, floored at 0.01
+        assert abs(batch_ticks[0]["price"] - 18500.0) <= 10.0
+        assert all(t["price"] >= 0.01 for t in batch_ticks)
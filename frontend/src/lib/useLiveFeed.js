@@ -1,6 +1,7 @@
 import { useEffect, useMemo, useRef, useState } from 'react';
 
 const WS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws/live';
+const decoder = new TextDecoder();
 
 export function useLiveFeed() {
   const [status, setStatus] = useState('disconnected'); // 'connecting' | 'connected' | 'disconnected'
@@ -15,6 +16,8 @@ export function useLiveFeed() {
     function connect() {
       setStatus('connecting');
       const ws = new WebSocket(WS_URL);
+      // Server broadcasts share one encoded payload and arrive as binary frames
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
       ws.onopen = () => setStatus('connected');
       ws.onclose = () => {
@@ -25,8 +28,27 @@ export function useLiveFeed() {
       ws.onerror = () => ws.close();
       ws.onmessage = (ev) => {
         try {
-          const msg = JSON.parse(ev.data);
+          const raw = typeof ev.data === 'string' ? ev.data : decoder.decode(ev.data);
+          const msg = JSON.parse(raw);
           switch (msg.type) {
+            case 'price_batch': {
+              // One message per tick carrying every ticker; fold into state
+              // with a single update
+              setPrices((prev) => {
+                const next = { ...prev };
+                for (const t of msg.ticks) {
+                  const prevTicker = prev[t.ticker]?.price ?? null;
+                  const prevOpen = prev[t.ticker]?.open ?? null;
+                  next[t.ticker] = {
+                    price: t.price,
+                    prev: prevTicker,
+                    open: t.open != null ? t.open : prevOpen,
+                  };
+                }
+                return next;
+              });
+              break;
+            }
             case 'price_update': {
               setPrices((prev) => {
                 const prevTicker = prev[msg.ticker]?.price ?? null;